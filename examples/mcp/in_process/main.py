@@ -21,23 +21,22 @@ async def run(mcp_server: MCPServer):
         model_settings=ModelSettings(tool_choice="required"),
     )
 
-    # Use the `add` tool to add two numbers
-    message = "Add these numbers: 7 and 22."
-    print(f"Running: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print(result.final_output)
-
-    # Run the `get_weather` tool
-    message = "What's the weather in Tokyo?"
-    print(f"\n\nRunning: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print(result.final_output)
-
-    # Run the `get_secret_word` tool
-    message = "What's the secret word?"
-    print(f"\n\nRunning: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print(result.final_output)
+    messages = [
+        # Use the `add` tool to add two numbers
+        "Add these numbers: 7 and 22.",
+        # Run the `get_weather` tool
+        "What's the weather in Tokyo?",
+        # Run the `get_secret_word` tool
+        "What's the secret word?",
+    ]
+
+    # The queries are independent, so run them concurrently and print the results in order
+    results = await asyncio.gather(
+        *(Runner.run(starting_agent=agent, input=message) for message in messages)
+    )
+    for i, (message, result) in enumerate(zip(messages, results)):
+        print(f"\n\nRunning: {message}" if i else f"Running: {message}")
+        print(result.final_output)
 
 
 async def main():
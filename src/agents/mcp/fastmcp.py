@@ -1,5 +1,8 @@
+import asyncio
+import json
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 from fastmcp.client import Client, ClientTransport
 from fastmcp.server import FastMCP
@@ -9,17 +12,121 @@ from mcp.types import CallToolResult, Tool
 from ..mcp import MCPServer
 
 
+class _SharedClient:
+    """A fastmcp client that is opened and closed by its own owner task.
+
+    The fastmcp session runs inside an anyio task group, which can only be exited by the task that
+    entered it. Keeping that in a dedicated task lets servers connected from different tasks use
+    the client and release it in any order.
+    """
+
+    def __init__(self, transport: Any):
+        # Kept alive so that `id(transport)` can't be reused while the client is registered
+        self.transport = transport
+        self.client = Client(transport)
+        self.refcount = 0
+        self._loop = asyncio.get_running_loop()
+        self._connected: asyncio.Future[None] = self._loop.create_future()
+        self._close = asyncio.Event()
+        self._owner = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            await self.client.__aenter__()
+        except Exception as e:
+            self._connected.set_exception(e)
+            return
+        except BaseException:
+            self._connected.cancel()
+            raise
+
+        self._connected.set_result(None)
+        try:
+            await self._close.wait()
+        finally:
+            await self.client.__aexit__(None, None, None)
+
+    def is_usable(self) -> bool:
+        """Whether servers in the running event loop can still use this client. The owner task
+        ends when the client is closed, or when its event loop shuts down without a cleanup.
+        """
+        return self._loop is asyncio.get_running_loop() and not self._owner.done()
+
+    async def wait_connected(self):
+        await asyncio.shield(self._connected)
+
+    async def close(self):
+        if self._loop is not asyncio.get_running_loop():
+            # The owner task was cancelled, and the client closed, when its event loop shut down
+            return
+
+        self._close.set()
+        if not self._connected.done():
+            # Nobody is waiting for the connection any more, so don't wait for the handshake
+            self._owner.cancel()
+        await asyncio.wait([self._owner])
+
+        # A connection error was already raised to whoever was waiting for it
+        if not self._connected.cancelled():
+            self._connected.exception()
+        # Re-raise errors from closing the client
+        if not self._owner.cancelled():
+            self._owner.result()
+
+
 class FastMCPServer(MCPServer):
     """
     Support fastmcp transport implementations, include in-memory fastmcp servers.
     """
 
+    # Clients shared by servers created with `share_client=True`, keyed by `id(transport)`
+    _shared_clients: ClassVar[dict[int, _SharedClient]] = {}
+
     def __init__(
         self,
         transport: ClientTransport | FastMCP | AnyUrl | Path | str,
         name: str | None = None,
+        cache_tools_list: bool = False,
+        tools_cache_ttl: float | None = None,
+        idempotent_tools: set[str] | None = None,
+        share_client: bool = False,
     ):
+        """
+        Args:
+            transport: The fastmcp transport, an in-process `FastMCP` server, or anything
+                `fastmcp.client.Client` can infer a transport from (URL, script path, ...).
+            name: A readable name for the server. If not provided, we'll create one from the
+                transport.
+            cache_tools_list: Whether to cache the tools list. If `True`, the tools list will be
+                cached and only fetched from the server again once the cache expires or is
+                invalidated by calling `invalidate_tools_cache()`. You should set this to `True`
+                if you know the server will not change its tools list, because it avoids a
+                round-trip to the server on every agent turn.
+            tools_cache_ttl: How long, in seconds, a cached tools list stays valid. If `None`,
+                the cache never expires on its own. Only used when `cache_tools_list` is `True`.
+            idempotent_tools: Names of tools that are safe to deduplicate. Concurrent calls to one
+                of these tools with identical arguments share a single request to the server
+                instead of each issuing their own.
+            share_client: Whether to share one connection with other servers created with
+                `share_client=True` from the same transport object. The first `connect()` opens
+                the connection, later ones reuse it, and it is closed once every server sharing it
+                has been cleaned up. This avoids a handshake per server when many agents use the
+                same transport.
+        """
+        self._transport = transport
         self._client = Client(transport)
+        self.share_client = share_client
+        self._shared: _SharedClient | None = None
+        self.cache_tools_list = cache_tools_list
+        self.tools_cache_ttl = tools_cache_ttl
+
+        # The cache is always dirty at startup, so that we fetch tools at least once
+        self._cache_dirty = True
+        self._tools_list: list[Tool] | None = None
+        self._tools_fetched_at = 0.0
+
+        self.idempotent_tools = idempotent_tools or set()
+        self._inflight_calls: dict[tuple[str, str], asyncio.Task[CallToolResult]] = {}
         if not name:
             if isinstance(transport, FastMCP):
                 name = transport.name
@@ -28,28 +135,112 @@ class FastMCPServer(MCPServer):
         self._name = name
 
     async def connect(self):
-        await self._client.__aenter__()
+        if not self.share_client:
+            await self._client.__aenter__()
+            return
+
+        key = id(self._transport)
+        shared = self._shared_clients.get(key)
+        if shared is None or not shared.is_usable():
+            # Replace clients left behind by a previous event loop or closed without a cleanup
+            shared = self._shared_clients[key] = _SharedClient(self._transport)
+        shared.refcount += 1
+        self._shared = shared
+        self._client = shared.client
+        try:
+            await shared.wait_connected()
+        except BaseException:
+            await self._release_shared_client()
+            raise
 
     async def cleanup(self):
-        await self._client.__aexit__(None, None, None)
+        await self._disconnect(None, None, None)
 
     async def __aenter__(self):
         await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        await self._client.__aexit__(exc_type, exc_value, traceback)
+        await self._disconnect(exc_type, exc_value, traceback)
+
+    async def _disconnect(self, exc_type, exc_value, traceback):
+        if self._shared is None:
+            await self._client.__aexit__(exc_type, exc_value, traceback)
+        else:
+            await self._release_shared_client()
+
+    async def _release_shared_client(self):
+        shared = self._shared
+        if shared is None:
+            return
+
+        # Go back to a private, unconnected client so this server stops using the shared one
+        self._shared = None
+        self._client = Client(self._transport)
+
+        shared.refcount -= 1
+        if shared.refcount > 0:
+            return
+
+        key = id(self._transport)
+        if self._shared_clients.get(key) is shared:
+            del self._shared_clients[key]
+        await shared.close()
 
     @property
     def name(self) -> str:
         return self._name
 
+    def invalidate_tools_cache(self):
+        """Invalidate the tools cache."""
+        self._cache_dirty = True
+
+    def _tools_cache_expired(self) -> bool:
+        if self.tools_cache_ttl is None:
+            return False
+        return time.monotonic() - self._tools_fetched_at >= self.tools_cache_ttl
+
     async def list_tools(self) -> list[Tool]:
-        return await self._client.list_tools()
+        # Return from cache if caching is enabled, we have tools, and the cache is still fresh
+        if (
+            self.cache_tools_list
+            and not self._cache_dirty
+            and self._tools_list
+            and not self._tools_cache_expired()
+        ):
+            return self._tools_list
+
+        self._cache_dirty = False
+        self._tools_list = await self._client.list_tools()
+        self._tools_fetched_at = time.monotonic()
+        return self._tools_list
 
     async def call_tool(
         self, tool_name: str, arguments: dict[str, Any] | None
     ) -> CallToolResult:
-        return await self._client.call_tool(
-            tool_name, arguments, _return_raw_result=True
-        )
+        if tool_name not in self.idempotent_tools:
+            return await self._client.call_tool(
+                tool_name, arguments, _return_raw_result=True
+            )
+
+        key = (tool_name, json.dumps(arguments, sort_keys=True))
+        task = self._inflight_calls.get(key)
+        if task is None:
+            # Run the call in its own task, so it is owned by none of the callers waiting on it
+            task = asyncio.ensure_future(
+                self._client.call_tool(tool_name, arguments, _return_raw_result=True)
+            )
+            self._inflight_calls[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight_call(key, done))
+
+        # Shield so that a cancelled caller doesn't cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def _forget_inflight_call(
+        self, key: tuple[str, str], task: asyncio.Task[CallToolResult]
+    ) -> None:
+        if self._inflight_calls.get(key) is task:
+            del self._inflight_calls[key]
+        # Mark the exception as retrieved, so there's no warning if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,222 @@
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastmcp.client import Client
+from fastmcp.server import FastMCP
+
+from agents.mcp.fastmcp import FastMCPServer
+
+
+def _make_mcp() -> FastMCP[Any]:
+    mcp: FastMCP[Any] = FastMCP("Test Server")
+
+    @mcp.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    return mcp
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_server_lists_and_calls_tools():
+    async with FastMCPServer(_make_mcp()) as server:
+        assert server.name == "Test Server"
+
+        tools = await server.list_tools()
+        assert [tool.name for tool in tools] == ["add"]
+
+        result = await server.call_tool("add", {"a": 1, "b": 2})
+        assert result.content[0].text == "3"
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_server_caching_works():
+    """Test that if we turn caching on, the list of tools is cached and not fetched from the server
+    on each call to `list_tools()`.
+    """
+    server = FastMCPServer(_make_mcp(), cache_tools_list=True)
+
+    async with server:
+        with patch.object(Client, "list_tools", wraps=server._client.list_tools) as mock_list_tools:
+            await server.list_tools()
+            assert mock_list_tools.call_count == 1, "list_tools() should have been called once"
+
+            # Call list_tools() again, should return the cached value
+            await server.list_tools()
+            assert mock_list_tools.call_count == 1, "list_tools() should not have been called again"
+
+            # Invalidate the cache and call list_tools() again
+            server.invalidate_tools_cache()
+            await server.list_tools()
+            assert mock_list_tools.call_count == 2, "list_tools() should be called again"
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_server_cache_expires_after_ttl():
+    server = FastMCPServer(_make_mcp(), cache_tools_list=True, tools_cache_ttl=60)
+
+    async with server:
+        with patch.object(Client, "list_tools", wraps=server._client.list_tools) as mock_list_tools:
+            await server.list_tools()
+            await server.list_tools()
+            assert mock_list_tools.call_count == 1, "cache should still be fresh"
+
+            # Pretend the tools were fetched longer ago than the TTL
+            server._tools_fetched_at -= 61
+            await server.list_tools()
+            assert mock_list_tools.call_count == 2, "cache should have expired"
+
+
+def _make_counting_mcp(calls: list[str]) -> FastMCP[Any]:
+    mcp: FastMCP[Any] = FastMCP("Counting Server")
+
+    @mcp.tool()
+    async def get_weather(city: str) -> str:
+        calls.append(city)
+        await asyncio.sleep(0.05)
+        return f"Sunny in {city}"
+
+    return mcp
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_server_coalesces_idempotent_calls():
+    calls: list[str] = []
+    server = FastMCPServer(_make_counting_mcp(calls), idempotent_tools={"get_weather"})
+
+    async with server:
+        results = await asyncio.gather(
+            server.call_tool("get_weather", {"city": "Tokyo"}),
+            server.call_tool("get_weather", {"city": "Tokyo"}),
+            server.call_tool("get_weather", {"city": "Paris"}),
+        )
+
+        assert calls == ["Tokyo", "Paris"], "identical in-flight calls should be coalesced"
+        assert results[0] is results[1]
+        assert results[2].content[0].text == "Sunny in Paris"  # type: ignore[union-attr]
+
+        # Once the call has finished, a new call goes to the server again
+        await server.call_tool("get_weather", {"city": "Tokyo"})
+        assert calls == ["Tokyo", "Paris", "Tokyo"]
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_server_cancelling_first_caller_does_not_cancel_others():
+    calls: list[str] = []
+    server = FastMCPServer(_make_counting_mcp(calls), idempotent_tools={"get_weather"})
+
+    async with server:
+        leader = asyncio.create_task(server.call_tool("get_weather", {"city": "Tokyo"}))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(server.call_tool("get_weather", {"city": "Tokyo"}))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        result = await follower
+
+        assert leader.cancelled()
+        assert result.content[0].text == "Sunny in Tokyo"  # type: ignore[union-attr]
+        assert calls == ["Tokyo"]
+        assert server._inflight_calls == {}
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_server_does_not_coalesce_other_tools():
+    calls: list[str] = []
+    server = FastMCPServer(_make_counting_mcp(calls))
+
+    async with server:
+        await asyncio.gather(
+            server.call_tool("get_weather", {"city": "Tokyo"}),
+            server.call_tool("get_weather", {"city": "Tokyo"}),
+        )
+
+        assert calls == ["Tokyo", "Tokyo"]
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_servers_share_client_for_same_transport():
+    mcp = _make_mcp()
+
+    async with FastMCPServer(mcp, share_client=True) as server1:
+        async with FastMCPServer(mcp, share_client=True) as server2:
+            assert server1._client is server2._client
+
+            # A different transport gets its own client
+            async with FastMCPServer(_make_mcp(), share_client=True) as server3:
+                assert server3._client is not server1._client
+
+            # Servers that don't opt in keep their own client
+            async with FastMCPServer(mcp) as server4:
+                assert server4._client is not server1._client
+
+        # The connection stays open until the last server sharing it is cleaned up
+        assert server1._client.is_connected()
+        result = await server1.call_tool("add", {"a": 1, "b": 2})
+        assert result.content[0].text == "3"
+
+    assert FastMCPServer._shared_clients == {}
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_shared_client_works_across_tasks():
+    mcp = _make_mcp()
+    owner = FastMCPServer(mcp, share_client=True)
+    borrower = FastMCPServer(mcp, share_client=True)
+
+    await asyncio.create_task(owner.connect())
+    await asyncio.create_task(borrower.connect())
+    shared_client = borrower._client
+    assert owner._client is shared_client
+
+    # The server that opened the connection is cleaned up first, from its own task
+    await asyncio.create_task(owner.cleanup())
+    assert not owner._client.is_connected()
+    assert shared_client.is_connected()
+
+    result = await asyncio.create_task(borrower.call_tool("add", {"a": 1, "b": 2}))
+    assert result.content[0].text == "3"  # type: ignore[union-attr]
+
+    await asyncio.create_task(borrower.cleanup())
+    assert not shared_client.is_connected()
+    assert borrower._client is not shared_client
+    assert not borrower._client.is_connected()
+    assert FastMCPServer._shared_clients == {}
+
+
+def test_fastmcp_shared_client_is_not_reused_across_event_loops():
+    mcp = _make_mcp()
+
+    async def connect_without_cleanup():
+        await FastMCPServer(mcp, share_client=True).connect()
+
+    async def add():
+        async with FastMCPServer(mcp, share_client=True) as server:
+            return await server.call_tool("add", {"a": 1, "b": 2})
+
+    # The first loop shuts down without the server being cleaned up
+    asyncio.run(connect_without_cleanup())
+
+    result = asyncio.run(add())
+    assert result.content[0].text == "3"
+    assert FastMCPServer._shared_clients == {}
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_cancelled_connect_does_not_wait_for_handshake():
+    async def hanging_aenter(self):
+        await asyncio.Event().wait()
+
+    server = FastMCPServer(_make_mcp(), share_client=True)
+
+    with patch.object(Client, "__aenter__", hanging_aenter):
+        task = asyncio.create_task(server.connect())
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1)
+
+    assert FastMCPServer._shared_clients == {}